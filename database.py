@@ -5,12 +5,14 @@ import sqlite3
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import config
+from models import InvoiceColumns, TopList, WorkOrderColumns
 
 class DatabaseManager:
     def __init__(self, db_path: str = config.DB_PATH):
         self.db_path = db_path
+        self._settings_cache = {}  # key -> value, or None if the key is unset
         self.init_database()
         
     def get_connection(self) -> sqlite3.Connection:
@@ -207,6 +209,21 @@ class DatabaseManager:
             conn.commit()
             return cursor.rowcount
     
+    def checkpoint(self):
+        """Write any pending WAL frames back into the main database file"""
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA wal_checkpoint(FULL)")
+    
+    def _iter_query(self, query: str, params: tuple = (), batch: int = 10000) -> Iterator[tuple]:
+        """Execute a SELECT query and yield plain tuples, fetched in blocks of batch rows"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # Skip building sqlite3.Row objects
+            cursor.arraysize = batch
+            cursor.execute(query, params)
+            while rows := cursor.fetchmany():
+                yield from rows
+    
     def get_last_insert_id(self) -> int:
         """Get the last inserted row ID"""
         with self.get_connection() as conn:
@@ -228,6 +245,11 @@ class DatabaseManager:
         query = "SELECT * FROM customers ORDER BY name"
         return self.execute_query(query)
     
+    def iter_customers(self, batch: int = 10000) -> Iterator[tuple]:
+        """Stream all customers in export column order"""
+        query = "SELECT id, name, phone, address, created_at FROM customers ORDER BY name"
+        return self._iter_query(query, batch=batch)
+    
     def search_customers(self, search_term: str) -> List[sqlite3.Row]:
         """Search customers by name or phone"""
         query = "SELECT * FROM customers WHERE name LIKE ? OR phone LIKE ? ORDER BY name"
@@ -263,6 +285,16 @@ class DatabaseManager:
         '''
         return self.execute_query(query)
     
+    def iter_vehicles(self, batch: int = 10000) -> Iterator[tuple]:
+        """Stream all vehicles in export column order"""
+        query = '''
+            SELECT v.id, v.license_plate, v.brand, v.model, v.customer_phone, v.created_at
+            FROM vehicles v
+            JOIN customers c ON v.customer_phone = c.phone
+            ORDER BY v.license_plate
+        '''
+        return self._iter_query(query, batch=batch)
+    
     def search_vehicles(self, search_term: str) -> List[sqlite3.Row]:
         """Search vehicles by license plate"""
         query = '''
@@ -305,6 +337,17 @@ class DatabaseManager:
         '''
         return self.execute_query(query)
 
+    def iter_work_orders(self, batch: int = 10000) -> Iterator[tuple]:
+        """Stream all work orders in export column order"""
+        query = '''
+            SELECT wo.id, wo.vehicle_id, wo.entry_date, wo.status, wo.total_cost, wo.payment_status, wo.created_at
+            FROM work_orders wo
+            JOIN vehicles v ON wo.vehicle_id = v.id
+            JOIN customers c ON v.customer_phone = c.phone
+            ORDER BY wo.entry_date DESC
+        '''
+        return self._iter_query(query, batch=batch)
+    
     def search_work_orders(self, keyword: str) -> List[sqlite3.Row]:
         """Search work orders by customer name or service/part name/description (case-insensitive)."""
         # Normalize keyword for case-insensitive LIKE matching
@@ -331,20 +374,42 @@ class DatabaseManager:
         - keyword: matches customer name, service/part name or description (case-insensitive, partial)
         - service_type: one of 'Preventive', 'Corrective', 'Inspection' (case-insensitive)
         """
+        query, params = self._work_order_filter_query(
+            "wo.*, v.license_plate, v.brand, v.model, c.name as customer_name, c.phone as customer_phone",
+            keyword, service_type)
+        return self.execute_query(query, params)
+
+    def get_work_order_columns(self, keyword: str = "", service_type: Optional[str] = None,
+                               status: Optional[str] = None) -> WorkOrderColumns:
+        """Get the work order list view columns, optionally filtered like filter_work_orders and by status"""
+        query, params = self._work_order_filter_query(
+            "wo.id, v.license_plate, c.name, wo.entry_date, wo.status, wo.total_cost, wo.payment_status",
+            keyword, service_type, status)
+        return WorkOrderColumns.from_rows(list(self._iter_query(query, params)))
+
+    def _work_order_filter_query(self, columns: str, keyword: str = "", service_type: Optional[str] = None,
+                                 status: Optional[str] = None) -> Tuple[str, tuple]:
+        """Build the SELECT for work orders filtered by keyword, service type and status"""
         keyword = (keyword or "").strip().lower()
         service_type = (service_type or "").strip().lower() or None
 
         base = [
-            "SELECT DISTINCT wo.*, v.license_plate, v.brand, v.model, c.name as customer_name, c.phone as customer_phone",
+            f"SELECT DISTINCT {columns}",
             "FROM work_orders wo",
             "JOIN vehicles v ON wo.vehicle_id = v.id",
             "JOIN customers c ON v.customer_phone = c.phone",
-            "LEFT JOIN services s ON s.work_order_id = wo.id",
-            "LEFT JOIN spare_parts p ON p.work_order_id = wo.id",
         ]
+        # Services and parts are only needed for the text filters
+        if keyword or service_type:
+            base.append("LEFT JOIN services s ON s.work_order_id = wo.id")
+            base.append("LEFT JOIN spare_parts p ON p.work_order_id = wo.id")
         conditions = []
         params: list = []
 
+        if status:
+            conditions.append("wo.status = ?")
+            params.append(status)
+
         if keyword:
             kw = f"%{keyword}%"
             conditions.append(
@@ -375,7 +440,7 @@ class DatabaseManager:
             query += "\nWHERE " + " AND ".join(conditions)
         query += "\nORDER BY wo.entry_date DESC"
 
-        return self.execute_query(query, tuple(params))
+        return query, tuple(params)
     
     def get_work_order_details(self, work_order_id: int) -> Optional[sqlite3.Row]:
         """Get detailed work order information"""
@@ -498,6 +563,18 @@ class DatabaseManager:
         '''
         return self.execute_query(query)
     
+    def get_invoice_columns(self) -> InvoiceColumns:
+        """Get the invoice list view columns"""
+        query = '''
+            SELECT i.id, i.work_order_id, i.invoice_date, i.total_amount, i.status, c.name, c.phone
+            FROM invoices i
+            JOIN work_orders wo ON i.work_order_id = wo.id
+            JOIN vehicles v ON wo.vehicle_id = v.id
+            JOIN customers c ON v.customer_phone = c.phone
+            ORDER BY i.invoice_date DESC
+        '''
+        return InvoiceColumns.from_rows(list(self._iter_query(query)))
+    
     def update_invoice_status(self, invoice_id: int, status: str) -> int:
         """Update invoice status"""
         query = "UPDATE invoices SET status = ? WHERE id = ?"
@@ -518,6 +595,23 @@ class DatabaseManager:
         query = "SELECT * FROM appointments ORDER BY date DESC, id DESC"
         return self.execute_query(query)
     
+    def get_appointment(self, appointment_id: int) -> Optional[sqlite3.Row]:
+        """Get a single appointment by id"""
+        rows = self.execute_query("SELECT * FROM appointments WHERE id = ? LIMIT 1", (appointment_id,))
+        return rows[0] if rows else None
+    
+    def get_appointments_for_list(self) -> List[sqlite3.Row]:
+        """Get appointments ready for display: (id, name, short description, MM/DD/YYYY date)"""
+        query = '''
+            SELECT id, name,
+                   CASE WHEN length(description) > 80
+                        THEN substr(description, 1, 77) || '...'
+                        ELSE COALESCE(description, '') END,
+                   COALESCE(strftime('%m/%d/%Y', substr(date, 1, 10)), substr(date, 1, 10), '')
+            FROM appointments ORDER BY date DESC, id DESC
+        '''
+        return self.execute_query(query)
+    
     def search_appointments(self, search_term: str) -> List[sqlite3.Row]:
         """Search appointments by name or date"""
         query = "SELECT * FROM appointments WHERE name LIKE ? OR date LIKE ? ORDER BY date DESC, id DESC"
@@ -537,14 +631,21 @@ class DatabaseManager:
     # Settings operations
     def get_setting(self, key: str, default: str = "") -> str:
         """Get a setting value"""
-        query = "SELECT value FROM settings WHERE key = ?"
-        result = self.execute_query(query, (key,))
-        return result[0]['value'] if result else default
+        if key in self._settings_cache:
+            value = self._settings_cache[key]
+        else:
+            query = "SELECT value FROM settings WHERE key = ?"
+            result = self.execute_query(query, (key,))
+            value = result[0]['value'] if result else None
+            self._settings_cache[key] = value
+        return default if value is None else value
     
     def set_setting(self, key: str, value: str) -> int:
         """Set a setting value"""
         query = "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)"
-        return self.execute_update(query, (key, value))
+        rowcount = self.execute_update(query, (key, value))
+        self._settings_cache[key] = value
+        return rowcount
 
         # Service Template operations
         def add_service_template(self, name: str, description: str = "", default_price: float = 0,
@@ -656,7 +757,7 @@ class DatabaseManager:
         
         # Get most used services
         services_query = f'''
-            SELECT s.name, COUNT(*) as usage_count, SUM(s.quantity) as total_quantity
+            SELECT s.name, NULL as detail, COUNT(*) as usage_count, SUM(s.quantity) as total_quantity
             FROM services s
             JOIN work_orders wo ON s.work_order_id = wo.id
             {date_filter}
@@ -665,8 +766,7 @@ class DatabaseManager:
             LIMIT 10
         '''
         
-        services_stats = self.execute_query(services_query, params)
-        stats['top_services'] = [dict(row) for row in services_stats]
+        stats['top_services'] = TopList.from_rows(list(self._iter_query(services_query, params)), 'q')
         
         # Get most active customers
         customers_query = f'''
@@ -680,8 +780,7 @@ class DatabaseManager:
             LIMIT 10
         '''
         
-        customers_stats = self.execute_query(customers_query, params)
-        stats['top_customers'] = [dict(row) for row in customers_stats]
+        stats['top_customers'] = TopList.from_rows(list(self._iter_query(customers_query, params)))
         
         return stats
     
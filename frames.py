@@ -5,18 +5,92 @@ import tkinter as tk
 from tkinter import ttk
 import ttkbootstrap as ttkb
 from ttkbootstrap.constants import *
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import csv
+import functools
+import io
 import os
+import queue
+import re
+import shutil
+import threading
 from pathlib import Path
 
 import config
 import utils
 from dialogs import *
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
+from PIL import Image
+
+# Available ttkbootstrap themes
+_THEMES = ('flatly', 'litera', 'minty', 'lumen', 'sandstone', 'yeti', 'pulse',
+           'united', 'morph', 'journal', 'darkly', 'superhero', 'solar', 'cyborg', 'vapor')
+
+# Section label and column header rows for the CSV export
+_CUSTOMERS_HDR = (('CUSTOMERS',), ('ID', 'Name', 'Phone', 'Address', 'Created'))
+_VEHICLES_HDR = (('VEHICLES',), ('ID', 'License Plate', 'Brand', 'Model', 'Customer Phone', 'Created'))
+_WORK_ORDERS_HDR = (('WORK ORDERS',),
+                    ('ID', 'Vehicle ID', 'Entry Date', 'Status', 'Total Cost', 'Payment Status', 'Created'))
+
+# Currency strings for treeview rows; the same prices recur across rows
+_fmt_currency = functools.lru_cache(maxsize=4096)(utils.format_currency)
+# Shortened descriptions for treeview rows; standard services repeat text
+_truncate = functools.lru_cache(maxsize=2048)(utils.truncate_text)
+
+_ISO_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+_today = [None, '']
+
+
+def _today_str():
+    """Today's date as YYYY-MM-DD, formatted once per calendar day"""
+    today = date.today()
+    if _today[0] != today:
+        _today[0] = today
+        _today[1] = today.isoformat()
+    return _today[1]
+
+
+def _normalize_date(date_str):
+    """Return date_str as YYYY-MM-DD, accepting ISO or MM/DD/YYYY input.
+
+    Zero-padded ISO input is only validated, not re-formatted. Raises
+    ValueError for anything that is not a real date.
+    """
+    if _ISO_RE.match(date_str):
+        date.fromisoformat(date_str)
+        return date_str
+    try:
+        dt = datetime.strptime(date_str, '%Y-%m-%d')
+    except ValueError:
+        dt = datetime.strptime(date_str, '%m/%d/%Y')
+    return dt.strftime('%Y-%m-%d')
+
+
+def _bulk_fill(tree, rows):
+    """Fill a packed treeview with rows while it is unmapped.
+
+    The tree is taken out of the layout and its data columns hidden for the
+    duration of the fill so Tk does not recompute geometry per row. Rows are
+    inserted in reverse at index 0, which is O(1) per item in Tk, whereas
+    appending at END walks the sibling list on every insert. Returns the new
+    item ids in row order.
+    """
+    info = tree.pack_info()
+    slaves = tree.master.pack_slaves()
+    position = slaves.index(tree)
+    if position + 1 < len(slaves):
+        info['before'] = slaves[position + 1]
+    display_columns = tree.cget('displaycolumns')
+
+    tree.pack_forget()
+    tree.configure(displaycolumns=())
+    try:
+        iids = [tree.insert('', 0, values=values) for values in reversed(rows)]
+    finally:
+        tree.configure(displaycolumns=display_columns)
+        tree.pack(**info)
+    iids.reverse()
+    return iids
 
 class BaseFrame(ttk.Frame):
     """Base class for all application frames"""
@@ -34,6 +108,22 @@ class BaseFrame(ttk.Frame):
     def refresh(self):
         """Override in subclasses to refresh frame data"""
         pass
+    
+    def _build_tree(self, parent, cols, height=15):
+        """Create a headings-only Treeview from (name, text, width) tuples"""
+        tree = ttk.Treeview(parent, columns=[c[0] for c in cols], show='headings', height=height)
+        for name, text, width in cols:
+            tree.heading(name, text=text)
+            tree.column(name, width=width)
+        return tree
+    
+    def _debounce(self, fn, delay=150):
+        """Run fn after delay ms, restarting the timer if called again sooner"""
+        attr = '_deb_' + fn.__name__
+        pending = getattr(self, attr, None)
+        if pending:
+            self.after_cancel(pending)
+        setattr(self, attr, self.after(delay, fn))
 
 class CustomersFrame(BaseFrame):
     """Frame for customer management"""
@@ -127,8 +217,9 @@ class CustomersFrame(BaseFrame):
     def refresh(self):
         """Refresh customer data"""
         # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
         
         # Load customers
         search_term = self.search_var.get().strip()
@@ -204,6 +295,7 @@ class CustomersFrame(BaseFrame):
                     dialog.result['address']
                 )
                 utils.show_info("Success", "Customer updated successfully")
+                self.app.invalidate_reports()
                 self.refresh()
             except Exception as e:
                 utils.show_error("Error", f"Failed to update customer: {e}")
@@ -225,6 +317,7 @@ class CustomersFrame(BaseFrame):
             try:
                 self.db_manager.delete_customer(customer_id)
                 utils.show_info("Success", "Customer deleted successfully")
+                self.app.invalidate_reports()
                 self.refresh()
             except Exception as e:
                 utils.show_error("Error", f"Failed to delete customer: {e}")
@@ -322,8 +415,9 @@ class VehiclesFrame(BaseFrame):
     def refresh(self):
         """Refresh vehicle data"""
         # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
         
         # Load vehicles
         search_term = self.search_var.get().strip()
@@ -401,6 +495,7 @@ class VehiclesFrame(BaseFrame):
                     dialog.result['customer_phone']
                 )
                 utils.show_info("Success", "Vehicle updated successfully")
+                self.app.invalidate_reports()
                 self.refresh()
             except Exception as e:
                 utils.show_error("Error", f"Failed to update vehicle: {e}")
@@ -422,6 +517,7 @@ class VehiclesFrame(BaseFrame):
             try:
                 self.db_manager.delete_vehicle(vehicle_id)
                 utils.show_info("Success", "Vehicle deleted successfully")
+                self.app.invalidate_reports()
                 self.refresh()
             except Exception as e:
                 utils.show_error("Error", f"Failed to delete vehicle: {e}")
@@ -529,8 +625,9 @@ class WorkOrdersFrame(BaseFrame):
     def refresh(self):
         """Refresh work order data"""
         # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
         
         # Determine filters
         keyword = self.search_var.get().strip()
@@ -542,27 +639,22 @@ class WorkOrdersFrame(BaseFrame):
         elif selected.startswith("Service:"):
             service_type = selected.split(":", 1)[1].strip()
         
-        # Fetch with service type filter first
-        if keyword or service_type:
-            work_orders = self.db_manager.filter_work_orders(keyword=keyword, service_type=service_type)
-        else:
-            work_orders = self.db_manager.get_work_orders()
-        
-        # Apply status filter if any
-        if status_filter:
-            work_orders = [wo for wo in work_orders if wo['status'] == status_filter]
+        # Fetch only the displayed columns, with every filter applied in SQL
+        cols = self.db_manager.get_work_order_columns(
+            keyword=keyword, service_type=service_type, status=status_filter)
         
         # Populate treeview
-        for wo in work_orders:
-            entry_date = utils.format_date(wo['entry_date']) if wo['entry_date'] else ''
+        for wo_id, plate, customer, entry_date, status, total, payment in zip(
+                cols.ids, cols.license_plates, cols.customer_names, cols.entry_dates,
+                cols.statuses, cols.total_costs, cols.payment_statuses):
             self.tree.insert('', END, values=(
-                wo['id'],
-                wo['license_plate'],
-                wo['customer_name'],
-                entry_date,
-                wo['status'],
-                utils.format_currency(wo['total_cost'] or 0),
-                wo['payment_status']
+                wo_id,
+                plate,
+                customer,
+                utils.format_date(entry_date) if entry_date else '',
+                status,
+                _fmt_currency(total),
+                payment
             ))
     
     def add_work_order(self):
@@ -578,6 +670,7 @@ class WorkOrdersFrame(BaseFrame):
                     dialog.result['status']
                 )
                 utils.show_info("Success", "Work order created successfully")
+                self.app.invalidate_reports()
                 self.refresh()
                 
                 # Ask if user wants to add services/parts
@@ -601,7 +694,7 @@ class WorkOrdersFrame(BaseFrame):
     
     def view_details_by_id(self, work_order_id):
         """View details for specific work order ID"""
-        details_window = WorkOrderDetailsWindow(self, self.db_manager, work_order_id)
+        details_window = WorkOrderDetailsWindow(self, self.db_manager, work_order_id, self.app)
         self.wait_window(details_window.window)
         self.refresh()  # Refresh in case costs were updated
     
@@ -627,6 +720,7 @@ class WorkOrdersFrame(BaseFrame):
                     self.db_manager.update_work_order_payment_status(work_order_id, dialog.result['payment_status'])
                 
                 utils.show_info("Success", "Status updated successfully")
+                self.app.invalidate_reports()
                 self.refresh()
             except Exception as e:
                 utils.show_error("Error", f"Failed to update status: {e}")
@@ -720,22 +814,25 @@ class InvoicesFrame(BaseFrame):
     def refresh(self):
         """Refresh invoice data"""
         # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
         
         # Load invoices
-        invoices = self.db_manager.get_invoices()
+        cols = self.db_manager.get_invoice_columns()
         
         # Populate treeview
-        for inv in invoices:
+        for inv_id, wo_id, invoice_date, amount, status, customer, phone in zip(
+                cols.ids, cols.work_order_ids, cols.invoice_dates, cols.total_amounts,
+                cols.statuses, cols.customer_names, cols.customer_phones):
             self.tree.insert('', END, values=(
-                inv['id'],
-                inv['work_order_id'],
-                utils.format_date(inv['invoice_date'][:10]) if inv['invoice_date'] else '',
-                utils.format_currency(inv['total_amount']),
-                inv['status'],
-                inv['customer_name'],
-                inv['customer_phone']
+                inv_id,
+                wo_id,
+                utils.format_date(invoice_date[:10]) if invoice_date else '',
+                _fmt_currency(amount),
+                status,
+                customer,
+                phone
             ))
     
     def on_search(self, *args):
@@ -757,6 +854,7 @@ class InvoicesFrame(BaseFrame):
         try:
             self.db_manager.update_invoice_status(invoice_id, status)
             utils.show_info("Success", f"Invoice marked as {status}")
+            self.app.invalidate_reports()
             self.refresh()
         except Exception as e:
             utils.show_error("Error", f"Failed to update status: {e}")
@@ -764,6 +862,16 @@ class InvoicesFrame(BaseFrame):
 class AppointmentsFrame(BaseFrame):
     """Frame for appointment management"""
     
+    COLUMNS = (
+        ('ID', 'ID', 60),
+        ('Name', 'Name', 220),
+        ('Description', 'Description', 500),
+        ('Date', 'Date', 120),
+    )
+    
+    # Extra rows rendered past the bottom of the visible window
+    WINDOW_BUFFER = 2
+    
     def setup_frame(self):
         # Create main container
         main_frame = ttk.Frame(self)
@@ -793,14 +901,10 @@ class AppointmentsFrame(BaseFrame):
         # Date (DatePicker)
         ttk.Label(fields_frame, text="Date:").grid(row=0, column=4, sticky=W, pady=5)
         self.date_var = tk.StringVar()
-        # Try to use ttkbootstrap DateEntry, fallback to Entry
-        try:
-            from ttkbootstrap.widgets import DateEntry
-            self.date_entry = DateEntry(fields_frame, textvariable=self.date_var, width=18, bootstyle=PRIMARY)
-        except Exception:
-            self.date_entry = ttk.Entry(fields_frame, textvariable=self.date_var, width=20)
+        # Plain Entry: ttkbootstrap's DateEntry is a Frame and cannot take a textvariable
+        self.date_entry = ttk.Entry(fields_frame, textvariable=self.date_var, width=20)
         self.date_entry.grid(row=0, column=5, pady=5, padx=(10, 0), sticky=W)
-        self.date_var.set(datetime.now().strftime('%Y-%m-%d'))
+        self.date_var.set(_today_str())
         
         # Description (multi-line)
         ttk.Label(fields_frame, text="Description:").grid(row=1, column=0, sticky=NW, pady=5)
@@ -826,55 +930,145 @@ class AppointmentsFrame(BaseFrame):
         tree_frame = ttk.Frame(parent)
         tree_frame.pack(fill=BOTH, expand=True)
         
-        columns = ('ID', 'Name', 'Description', 'Date')
-        self.tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=16)
+        self.tree = self._build_tree(tree_frame, self.COLUMNS, height=16)
         
-        self.tree.heading('ID', text='ID')
-        self.tree.heading('Name', text='Name')
-        self.tree.heading('Description', text='Description')
-        self.tree.heading('Date', text='Date')
-        
-        self.tree.column('ID', width=60)
-        self.tree.column('Name', width=220)
-        self.tree.column('Description', width=500)
-        self.tree.column('Date', width=120)
-        
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient=VERTICAL, command=self.tree.yview)
+        # The vertical scrollbar drives a window over self._all_appts rather
+        # than the tree itself; only the visible rows are ever inserted
+        self._all_appts = []
+        self._first_row = 0
+        self._selected_iid = None
+        self._loaded_row = None  # (iid, values) currently shown in the form
+        self._row_index = {}
+        self.v_scrollbar = ttk.Scrollbar(tree_frame, orient=VERTICAL, command=self._on_vscroll)
         h_scrollbar = ttk.Scrollbar(tree_frame, orient=HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.tree.configure(xscrollcommand=h_scrollbar.set)
         
         self.tree.pack(side=LEFT, fill=BOTH, expand=True)
-        v_scrollbar.pack(side=RIGHT, fill=Y)
+        self.v_scrollbar.pack(side=RIGHT, fill=Y)
         h_scrollbar.pack(side=BOTTOM, fill=X)
         
         self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
+        self.tree.bind('<Configure>', lambda e: self._render_window())
+        self.tree.bind('<MouseWheel>', lambda e: self._scroll_rows(-3 if e.delta > 0 else 3))
+        self.tree.bind('<Button-4>', lambda e: self._scroll_rows(-3))
+        self.tree.bind('<Button-5>', lambda e: self._scroll_rows(3))
+        self.tree.bind('<Up>', lambda e: self._step_selection(-1))
+        self.tree.bind('<Down>', lambda e: self._step_selection(1))
     
     def refresh(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        appointments = self.db_manager.get_appointments()
-        for appt in appointments:
-            self.tree.insert('', END, values=(
-                appt['id'],
-                appt['name'],
-                utils.truncate_text(appt['description'] or '', 80),
-                utils.format_date(appt['date'][:10]) if appt['date'] else ''
-            ))
+        # Truncation and date formatting are done by the query
+        self._all_appts = [tuple(row) for row in self.db_manager.get_appointments_for_list()]
+        # Position of each appointment in the full list, by tree iid
+        self._row_index = {str(values[0]): i for i, values in enumerate(self._all_appts)}
+        self._appts_by_id = {}
+        self._render_window()
+    
+    def _get_appointment(self, appt_id):
+        """Full appointment row by id, cached until the next refresh"""
+        row = self._appts_by_id.get(appt_id)
+        if row is None:
+            row = self.db_manager.get_appointment(appt_id)
+            if row is not None:
+                self._appts_by_id[appt_id] = row
+        return row
+    
+    def _visible_rows(self):
+        """Number of data rows that fit below the heading at the tree's current height"""
+        height = self.tree.winfo_height()
+        if height <= 1:  # Not mapped yet
+            return int(self.tree.cget('height'))
+        # The first rendered row sits directly under the heading, so its
+        # bbox gives both the heading height and the row height
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else ''
+        if bbox:
+            heading_height, row_height = bbox[1], bbox[3]
+        else:
+            try:
+                row_height = int(ttk.Style().lookup('Treeview', 'rowheight'))
+            except (TypeError, ValueError):
+                row_height = 20
+            heading_height = row_height
+        return max(1, (height - heading_height) // row_height)
+    
+    def _render_window(self):
+        """Insert only the rows currently scrolled into view"""
+        total = len(self._all_appts)
+        visible = self._visible_rows()
+        first = max(0, min(self._first_row, total - visible))
+        last = min(total, first + visible + self.WINDOW_BUFFER)
+        self._first_row = first
+        
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        for values in reversed(self._all_appts[first:last]):
+            self.tree.insert('', 0, iid=str(values[0]), values=values)
+        self.tree.yview_moveto(0)
+        
+        if self._selected_iid and self.tree.exists(self._selected_iid):
+            self.tree.selection_set(self._selected_iid)
+        
+        if total:
+            self.v_scrollbar.set(first / total, min(1.0, (first + visible) / total))
+        else:
+            self.v_scrollbar.set(0.0, 1.0)
+    
+    def _scroll_rows(self, count):
+        self._first_row += count
+        self._render_window()
+        return 'break'
+    
+    def _on_vscroll(self, action, *args):
+        """Translate scrollbar commands into a new window position"""
+        if action == 'moveto':
+            self._first_row = int(float(args[0]) * len(self._all_appts))
+        elif action == 'scroll':
+            step = self._visible_rows() if args[1] == 'pages' else 1
+            self._first_row += int(args[0]) * step
+        self._render_window()
+    
+    def _step_selection(self, step):
+        """Move the selection with Up/Down, scrolling the window at its edges.
+        
+        Works from _selected_iid, so it keeps going when the selected row has
+        been scrolled out of the rendered window.
+        """
+        position = self._row_index.get(self._selected_iid)
+        if position is None:
+            return None
+        target = position + step
+        if not 0 <= target < len(self._all_appts):
+            return 'break'
+        self._selected_iid = str(self._all_appts[target][0])
+        visible = self._visible_rows()
+        if self._first_row <= target < self._first_row + visible:
+            self.tree.selection_set(self._selected_iid)
+        else:
+            self._first_row = target if step < 0 else target - visible + 1
+            self._render_window()
+        self.tree.focus(self._selected_iid)
+        return 'break'
     
     def on_tree_select(self, event=None):
         selection = self.tree.selection()
         if not selection:
             return
+        self._selected_iid = selection[0]
         item = self.tree.item(selection[0])
         values = item['values']
+        # A window render re-selects the same row; only reload the form when
+        # the selected record changed, so unsaved edits survive scrolling
+        loaded = (selection[0], tuple(values))
+        if loaded == self._loaded_row:
+            return
+        self._loaded_row = loaded
         self.id_var.set(values[0])
         self.name_var.set(values[1])
         # Fetch full description from DB in case it was truncated
         try:
-            appt_id = int(values[0])
-            full = [a for a in self.db_manager.get_appointments() if a['id'] == appt_id]
-            desc = full[0]['description'] if full else values[2]
+            full = self._get_appointment(int(values[0]))
+            desc = full['description'] if full else values[2]
         except Exception:
             desc = values[2]
         self.description_text.delete('1.0', tk.END)
@@ -888,15 +1082,22 @@ class AppointmentsFrame(BaseFrame):
         except Exception:
             self.date_var.set(date_raw)
     
+    def _get_desc(self):
+        """Description text without the newline Tk appends at 'end'"""
+        return self.description_text.get('1.0', 'end-1c').strip()
+    
     def clear_fields(self):
+        self._selected_iid = None
+        self._loaded_row = None
+        self.tree.selection_remove(self.tree.selection())
         self.id_var.set("")
         self.name_var.set("")
         self.description_text.delete('1.0', tk.END)
-        self.date_var.set(datetime.now().strftime('%Y-%m-%d'))
+        self.date_var.set(_today_str())
     
     def create_appointment(self):
         name = self.name_var.get().strip()
-        description = self.description_text.get('1.0', tk.END).strip()
+        description = self._get_desc()
         date_str = self.date_var.get().strip()
         if not name:
             utils.show_error("Validation Error", "Name is required")
@@ -905,13 +1106,7 @@ class AppointmentsFrame(BaseFrame):
             utils.show_error("Validation Error", "Date is required")
             return
         try:
-            # normalize to YYYY-MM-DD
-            try:
-                dt = datetime.strptime(date_str, '%Y-%m-%d')
-                date_norm = dt.strftime('%Y-%m-%d')
-            except ValueError:
-                dt = datetime.strptime(date_str, '%m/%d/%Y')
-                date_norm = dt.strftime('%Y-%m-%d')
+            date_norm = _normalize_date(date_str)
             self.db_manager.add_appointment(name, description, date_norm)
             utils.show_info("Success", "Appointment created")
             self.refresh()
@@ -920,17 +1115,19 @@ class AppointmentsFrame(BaseFrame):
             utils.show_error("Error", f"Failed to create appointment: {e}")
     
     def read_appointment(self):
-        selection = self.tree.selection()
-        if not selection:
+        # The selected row may be scrolled out of the rendered window, so go
+        # by the record loaded into the form rather than the tree selection
+        appt_id = self.id_var.get().strip()
+        if not appt_id:
             utils.show_warning("No Selection", "Please select an appointment to read")
             return
-        item = self.tree.item(selection[0])
-        appt_id, name, _, date_disp = item['values']
         # Fetch full row
-        appts = self.db_manager.get_appointments()
-        row = next((a for a in appts if a['id'] == appt_id), None)
-        description = row['description'] if row else ''
-        utils.show_info("Appointment Details", f"ID: {appt_id}\nName: {name}\nDate: {date_disp}\n\nDescription:\n{description}")
+        row = self._get_appointment(int(appt_id))
+        if row is None:
+            utils.show_error("Error", "Appointment not found")
+            return
+        utils.show_info("Appointment Details", f"ID: {appt_id}\nName: {row['name']}\n"
+                        f"Date: {utils.format_date(row['date'])}\n\nDescription:\n{row['description'] or ''}")
     
     def update_appointment(self):
         appt_id = self.id_var.get().strip()
@@ -938,7 +1135,7 @@ class AppointmentsFrame(BaseFrame):
             utils.show_warning("No Selection", "Please select an appointment to update")
             return
         name = self.name_var.get().strip()
-        description = self.description_text.get('1.0', tk.END).strip()
+        description = self._get_desc()
         date_str = self.date_var.get().strip()
         if not name:
             utils.show_error("Validation Error", "Name is required")
@@ -947,12 +1144,7 @@ class AppointmentsFrame(BaseFrame):
             utils.show_error("Validation Error", "Date is required")
             return
         try:
-            try:
-                dt = datetime.strptime(date_str, '%Y-%m-%d')
-                date_norm = dt.strftime('%Y-%m-%d')
-            except ValueError:
-                dt = datetime.strptime(date_str, '%m/%d/%Y')
-                date_norm = dt.strftime('%Y-%m-%d')
+            date_norm = _normalize_date(date_str)
             self.db_manager.update_appointment(int(appt_id), name, description, date_norm)
             utils.show_info("Success", "Appointment updated")
             self.refresh()
@@ -981,6 +1173,25 @@ class AppointmentsFrame(BaseFrame):
 class ReportsFrame(BaseFrame):
     """Frame for reports and statistics"""
     
+    # (column, heading, width) for the statistics tables
+    REVENUE_COLUMNS = (
+        ('Period', 'Period', 150),
+        ('Orders', 'Orders', 100),
+        ('Revenue', 'Revenue', 150),
+        ('Avg Order Value', 'Avg Order Value', 150),
+    )
+    SERVICES_COLUMNS = (
+        ('Service', 'Service', 300),
+        ('Usage Count', 'Usage Count', 150),
+        ('Total Quantity', 'Total Quantity', 150),
+    )
+    CUSTOMERS_COLUMNS = (
+        ('Customer', 'Customer', 200),
+        ('Phone', 'Phone', 150),
+        ('Orders', 'Orders', 100),
+        ('Total Spent', 'Total Spent', 150),
+    )
+    
     def setup_frame(self):
         # Create main container
         main_frame = ttk.Frame(self)
@@ -997,73 +1208,84 @@ class ReportsFrame(BaseFrame):
         
         ttk.Label(range_frame, text="Date Range:").pack(side=LEFT, padx=(0, 10))
         
+        self._stats_cache = {}
+        
         self.date_range_var = tk.StringVar(value="This Month")
         date_combo = ttk.Combobox(range_frame, textvariable=self.date_range_var, width=20)
-        date_ranges = utils.get_date_range_options()
-        date_combo['values'] = [option[0] for option in date_ranges]
+        date_combo['values'] = [option[0] for option in utils.get_date_range_options()]
         date_combo.pack(side=LEFT, padx=(0, 10))
-        date_combo.bind('<<ComboboxSelected>>', lambda e: self.refresh_overview())
+        date_combo.bind('<<ComboboxSelected>>', lambda e: self._debounce(self.refresh_overview))
         
-        ttk.Button(range_frame, text="Refresh", command=self.refresh_overview,
+        ttk.Button(range_frame, text="Refresh", command=self.refresh,
                   bootstyle=PRIMARY).pack(side=LEFT, padx=10)
         
         # Statistics display
         self.stats_frame = ttk.Frame(main_frame)
         self.stats_frame.pack(fill=BOTH, expand=True, padx=10, pady=10)
         
+        # Statistics cards are built once; refresh_overview only sets values
+        cards_frame = ttk.Frame(self.stats_frame)
+        cards_frame.pack(fill=X, pady=(0, 20))
+        
+        self._stat_labels = {
+            'total_orders': self.create_stat_card(cards_frame, "Total Orders", "0", "📋", row=0, col=0),
+            'completed_orders': self.create_stat_card(cards_frame, "Completed", "0", "✅", row=0, col=1),
+            'open_orders': self.create_stat_card(cards_frame, "Open Orders", "0", "🔧", row=0, col=2),
+            'total_revenue': self.create_stat_card(cards_frame, "Total Revenue", "", "💰", row=1, col=0),
+            'avg_order_value': self.create_stat_card(cards_frame, "Avg Order Value", "", "📊", row=1, col=1),
+        }
+        
+        # Configure grid weights
+        for i in range(3):
+            cards_frame.grid_columnconfigure(i, weight=1)
+        
+        self.refresh_overview()
+    
+    def refresh(self):
+        self.invalidate()
         self.refresh_overview()
     
+    def invalidate(self):
+        """Drop cached statistics; call after any change to report data"""
+        self._stats_cache.clear()
+    
+    def _stats(self, start_date=None, end_date=None):
+        """Repair statistics for a date range, cached until invalidate()"""
+        key = (start_date, end_date)
+        stats = self._stats_cache.get(key)
+        if stats is None:
+            stats = self.db_manager.get_repair_statistics(start_date, end_date)
+            self._stats_cache[key] = stats
+        return stats
+    
     def refresh_overview(self):
         """Refresh overview statistics"""
-        # Clear existing widgets
-        for widget in self.stats_frame.winfo_children():
-            widget.destroy()
-        
         # Get date range
         selected_range = self.date_range_var.get()
-        date_ranges = utils.get_date_range_options()
         start_date, end_date = None, None
         
-        for option in date_ranges:
+        for option in utils.get_date_range_options():
             if option[0] == selected_range:
                 start_date, end_date = option[1], option[2]
                 break
         
         # Get statistics
-        stats = self.db_manager.get_repair_statistics(start_date, end_date)
-        
-        # Create statistics cards
-        cards_frame = ttk.Frame(self.stats_frame)
-        cards_frame.pack(fill=X, pady=(0, 20))
-
-        # Total orders card
-        self.create_stat_card(cards_frame, "Total Orders", str(stats.get('total_orders', 0)), 
-                             "📋", row=0, col=0)
-        
-        # Completed orders card
-        self.create_stat_card(cards_frame, "Completed", str(stats.get('completed_orders', 0)),
-                             "✅", row=0, col=1)
+        stats = self._stats(start_date, end_date)
         
-        # Open orders card
-        self.create_stat_card(cards_frame, "Open Orders", str(stats.get('open_orders', 0)), 
-                             "🔧", row=0, col=2)
+        # Update statistics cards
+        labels = self._stat_labels
+        labels['total_orders'].config(text=str(stats.get('total_orders', 0)))
+        labels['completed_orders'].config(text=str(stats.get('completed_orders', 0)))
+        labels['open_orders'].config(text=str(stats.get('open_orders', 0)))
         
-        # Total revenue card
         revenue = stats.get('total_revenue', 0) or 0
-        self.create_stat_card(cards_frame, "Total Revenue", utils.format_currency(revenue), 
-                             "💰", row=1, col=0)
+        labels['total_revenue'].config(text=utils.format_currency(revenue))
         
-        # Average order value card
         avg_value = stats.get('avg_order_value', 0) or 0
-        self.create_stat_card(cards_frame, "Avg Order Value", utils.format_currency(avg_value), 
-                             "📊", row=1, col=1)
-        
-        # Configure grid weights
-        for i in range(3):
-            cards_frame.grid_columnconfigure(i, weight=1)
+        labels['avg_order_value'].config(text=utils.format_currency(avg_value))
     
     def create_stat_card(self, parent, title, value, icon, row, col):
-        """Create a statistics card"""
+        """Create a statistics card and return its value label"""
         card = ttk.Frame(parent, style='', padding=20)
         """" style= 'light.TFrame' """
         card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
@@ -1078,8 +1300,10 @@ class ReportsFrame(BaseFrame):
                  style='info.TLabel').pack(side=LEFT, padx=(10, 0))
         
         # Value
-        ttk.Label(card, text=value, font=('Arial', 24, 'bold'), 
-                 style='info.TLabel').pack(pady=(10, 0))
+        value_label = ttk.Label(card, text=value, font=('Arial', 24, 'bold'), 
+                               style='info.TLabel')
+        value_label.pack(pady=(10, 0))
+        return value_label
     
     def create_revenue_tab(self, notebook):
         """Create revenue statistics tab"""
@@ -1096,7 +1320,7 @@ class ReportsFrame(BaseFrame):
         period_combo = ttk.Combobox(period_frame, textvariable=self.period_var, 
                                    values=["daily", "monthly", "yearly"], width=15)
         period_combo.pack(side=LEFT, padx=(0, 10))
-        period_combo.bind('<<ComboboxSelected>>', lambda e: self.refresh_revenue())
+        period_combo.bind('<<ComboboxSelected>>', lambda e: self._debounce(self.refresh_revenue))
         
         ttk.Button(period_frame, text="Refresh", command=self.refresh_revenue,
                   bootstyle=PRIMARY).pack(side=LEFT, padx=10)
@@ -1111,20 +1335,7 @@ class ReportsFrame(BaseFrame):
         table_frame = ttk.Frame(parent)
         table_frame.pack(fill=BOTH, expand=True, padx=10, pady=10)
         
-        columns = ('Period', 'Orders', 'Revenue', 'Avg Order Value')
-        self.revenue_tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
-        
-        # Define headings
-        self.revenue_tree.heading('Period', text='Period')
-        self.revenue_tree.heading('Orders', text='Orders')
-        self.revenue_tree.heading('Revenue', text='Revenue')
-        self.revenue_tree.heading('Avg Order Value', text='Avg Order Value')
-        
-        # Define column widths
-        self.revenue_tree.column('Period', width=150)
-        self.revenue_tree.column('Orders', width=100)
-        self.revenue_tree.column('Revenue', width=150)
-        self.revenue_tree.column('Avg Order Value', width=150)
+        self.revenue_tree = self._build_tree(table_frame, self.REVENUE_COLUMNS)
         
         # Scrollbar
         scrollbar = ttk.Scrollbar(table_frame, orient=VERTICAL, command=self.revenue_tree.yview)
@@ -1137,21 +1348,21 @@ class ReportsFrame(BaseFrame):
     def refresh_revenue(self):
         """Refresh revenue statistics"""
         # Clear existing items
-        for item in self.revenue_tree.get_children():
-            self.revenue_tree.delete(item)
+        children = self.revenue_tree.get_children()
+        if children:
+            self.revenue_tree.delete(*children)
         
         # Get revenue data
         period = self.period_var.get()
         revenue_data = self.db_manager.get_revenue_by_period(period)
         
         # Populate table
-        for data in revenue_data:
-            self.revenue_tree.insert('', END, values=(
-                data['period'],
-                data['order_count'],
-                utils.format_currency(data['revenue'] or 0),
-                utils.format_currency(data['avg_order_value'] or 0)
-            ))
+        _bulk_fill(self.revenue_tree, [(
+            data['period'],
+            data['order_count'],
+            _fmt_currency(data['revenue'] or 0),
+            _fmt_currency(data['avg_order_value'] or 0)
+        ) for data in revenue_data])
     
     def create_services_tab(self, notebook):
         """Create services statistics tab"""
@@ -1172,18 +1383,7 @@ class ReportsFrame(BaseFrame):
         table_frame = ttk.Frame(parent)
         table_frame.pack(fill=BOTH, expand=True, padx=10, pady=10)
         
-        columns = ('Service', 'Usage Count', 'Total Quantity')
-        self.services_tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
-        
-        # Define headings
-        self.services_tree.heading('Service', text='Service')
-        self.services_tree.heading('Usage Count', text='Usage Count')
-        self.services_tree.heading('Total Quantity', text='Total Quantity')
-        
-        # Define column widths
-        self.services_tree.column('Service', width=300)
-        self.services_tree.column('Usage Count', width=150)
-        self.services_tree.column('Total Quantity', width=150)
+        self.services_tree = self._build_tree(table_frame, self.SERVICES_COLUMNS)
         
         # Scrollbar
         scrollbar = ttk.Scrollbar(table_frame, orient=VERTICAL, command=self.services_tree.yview)
@@ -1196,20 +1396,17 @@ class ReportsFrame(BaseFrame):
     def refresh_services(self):
         """Refresh services statistics"""
         # Clear existing items
-        for item in self.services_tree.get_children():
-            self.services_tree.delete(item)
+        children = self.services_tree.get_children()
+        if children:
+            self.services_tree.delete(*children)
         
         # Get statistics
-        stats = self.db_manager.get_repair_statistics()
-        top_services = stats.get('top_services', [])
+        stats = self._stats()
+        top_services = stats['top_services']
         
         # Populate table
-        for service in top_services:
-            self.services_tree.insert('', END, values=(
-                service['name'],
-                service['usage_count'],
-                service['total_quantity']
-            ))
+        _bulk_fill(self.services_tree, list(zip(top_services.names, top_services.counts,
+                                                top_services.values)))
     
     def create_customers_tab(self, notebook):
         """Create customers statistics tab"""
@@ -1230,20 +1427,7 @@ class ReportsFrame(BaseFrame):
         table_frame = ttk.Frame(parent)
         table_frame.pack(fill=BOTH, expand=True, padx=10, pady=10)
         
-        columns = ('Customer', 'Phone', 'Orders', 'Total Spent')
-        self.customers_tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
-        
-        # Define headings
-        self.customers_tree.heading('Customer', text='Customer')
-        self.customers_tree.heading('Phone', text='Phone')
-        self.customers_tree.heading('Orders', text='Orders')
-        self.customers_tree.heading('Total Spent', text='Total Spent')
-        
-        # Define column widths
-        self.customers_tree.column('Customer', width=200)
-        self.customers_tree.column('Phone', width=150)
-        self.customers_tree.column('Orders', width=100)
-        self.customers_tree.column('Total Spent', width=150)
+        self.customers_tree = self._build_tree(table_frame, self.CUSTOMERS_COLUMNS)
         
         # Scrollbar
         scrollbar = ttk.Scrollbar(table_frame, orient=VERTICAL, command=self.customers_tree.yview)
@@ -1256,21 +1440,18 @@ class ReportsFrame(BaseFrame):
     def refresh_customers(self):
         """Refresh customers statistics"""
         # Clear existing items
-        for item in self.customers_tree.get_children():
-            self.customers_tree.delete(item)
+        children = self.customers_tree.get_children()
+        if children:
+            self.customers_tree.delete(*children)
         
         # Get statistics
-        stats = self.db_manager.get_repair_statistics()
-        top_customers = stats.get('top_customers', [])
+        stats = self._stats()
+        top_customers = stats['top_customers']
         
         # Populate table
-        for customer in top_customers:
-            self.customers_tree.insert('', END, values=(
-                customer['name'],
-                customer['phone'],
-                customer['order_count'],
-                utils.format_currency(customer['total_spent'] or 0)
-            ))
+        _bulk_fill(self.customers_tree, list(zip(top_customers.names, top_customers.details,
+                                                 top_customers.counts,
+                                                 map(_fmt_currency, top_customers.values))))
 
 class SettingsFrame(BaseFrame):
     """Frame for application settings"""
@@ -1279,23 +1460,19 @@ class SettingsFrame(BaseFrame):
         # Create main container with scrollable content
         canvas = tk.Canvas(self)
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
+        # The padded scrollable frame is the content container itself
+        main_frame = ttk.Frame(canvas, padding=20)
         
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        self._last_region = None
+        self._region_pending = None
+        main_frame.bind("<Configure>", lambda e: self._schedule_scrollregion(canvas, main_frame))
         
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.create_window((0, 0), window=main_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        main_frame = scrollable_frame
-        main_frame = ttk.Frame(main_frame, padding=20)
-        main_frame.pack(fill=BOTH, expand=True)
-        
         # Title
         title_label = ttk.Label(main_frame, text="Application Settings", 
                                font=config.FONTS['title'])
@@ -1310,6 +1487,19 @@ class SettingsFrame(BaseFrame):
         # Load current settings
         self.load_settings()
     
+    def _schedule_scrollregion(self, canvas, content):
+        """Coalesce <Configure> bursts into one scrollregion update at idle"""
+        if self._region_pending is None:
+            self._region_pending = self.after_idle(self._update_scrollregion, canvas, content)
+    
+    def _update_scrollregion(self, canvas, content):
+        """Size the scrollregion from the content frame, not canvas.bbox('all')"""
+        self._region_pending = None
+        region = (0, 0, content.winfo_width(), content.winfo_reqheight())
+        if region != self._last_region:
+            self._last_region = region
+            canvas.configure(scrollregion=region)
+    
     def create_appearance_section(self, parent):
         """Create appearance settings section"""
         # Appearance frame
@@ -1324,10 +1514,7 @@ class SettingsFrame(BaseFrame):
         
         self.theme_var = tk.StringVar()
         theme_combo = ttk.Combobox(theme_frame, textvariable=self.theme_var, width=20)
-        # Available ttkbootstrap themes
-        themes = ['flatly', 'litera', 'minty', 'lumen', 'sandstone', 'yeti', 'pulse', 
-                 'united', 'morph', 'journal', 'darkly', 'superhero', 'solar', 'cyborg', 'vapor']
-        theme_combo['values'] = themes
+        theme_combo['values'] = _THEMES
         theme_combo.pack(side=LEFT, padx=(0, 10))
         
         ttk.Button(theme_frame, text="Apply Theme", command=self.apply_theme,
@@ -1415,10 +1602,13 @@ class SettingsFrame(BaseFrame):
                 # Copy logo to logos directory
                 logo_path = config.LOGOS_DIR / "logo.png"
                 
-                # Load and resize image
+                # Load and downscale image. draft() lets the JPEG decoder
+                # scale while decoding; LANCZOS is much faster with the
+                # drop-in Pillow-SIMD build (pip install pillow-simd)
                 image = Image.open(filename)
-                image = image.resize((100, 100), Image.Resampling.LANCZOS)
-                image.save(logo_path)
+                image.draft('RGB', (200, 200))
+                image.thumbnail((100, 100), Image.Resampling.LANCZOS)
+                image.save(logo_path, optimize=True)
                 
                 utils.show_info("Success", "Logo updated successfully")
                 self.load_logo_preview()
@@ -1449,6 +1639,7 @@ class SettingsFrame(BaseFrame):
         logo_path = config.LOGOS_DIR / "logo.png"
         if logo_path.exists():
             try:
+                # utils.load_image caches the scaled image until the file changes
                 logo_image = utils.load_image(str(logo_path), (150, 75))
                 if logo_image:
                     preview_label = ttk.Label(self.logo_preview_frame, image=logo_image)
@@ -1471,8 +1662,10 @@ class SettingsFrame(BaseFrame):
         
         if filename:
             try:
-                import shutil
-                shutil.copy2(config.DB_PATH, filename)
+                # Flush any WAL frames so the raw byte copy is consistent,
+                # then copy data only; copyfile takes the sendfile path
+                self.db_manager.checkpoint()
+                shutil.copyfile(str(config.DB_PATH), filename)
                 utils.show_info("Success", f"Database backed up to {filename}")
             except Exception as e:
                 utils.show_error("Error", f"Failed to backup database: {e}")
@@ -1485,55 +1678,66 @@ class SettingsFrame(BaseFrame):
         )
         
         if filename:
-            try:
-                import csv
+            # Write on a background thread so the UI keeps responding; the
+            # result comes back through a queue drained on the Tk thread.
+            # Each export gets its own queue so overlapping runs don't mix
+            results = queue.Queue()
+            threading.Thread(target=self._export_worker, args=(filename, results), daemon=True).start()
+            self.after(100, self._drain_export_queue, results)
+    
+    def _export_worker(self, filename, results):
+        """Write the CSV export and post the outcome to results"""
+        try:
+            # Export customers, vehicles, and work orders, streaming rows
+            # straight from the database cursors through a 4 MiB buffer
+            with open(filename, 'wb', buffering=0) as raw, \
+                    io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=4 * 1024 * 1024),
+                                     encoding='utf-8', newline='', write_through=False) as csvfile:
+                writer = csv.writer(csvfile)
                 
-                # Export customers, vehicles, and work orders
-                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    
-                    # Customers
-                    writer.writerow(['CUSTOMERS'])
-                    writer.writerow(['ID', 'Name', 'Phone', 'Address', 'Created'])
-                    customers = self.db_manager.get_customers()
-                    for customer in customers:
-                        writer.writerow([customer['id'], customer['name'], customer['phone'], 
-                                       customer['address'], customer['created_at']])
-                    
-                    writer.writerow([])  # Empty row
-                    
-                    # Vehicles
-                    writer.writerow(['VEHICLES'])
-                    writer.writerow(['ID', 'License Plate', 'Brand', 'Model', 'Customer Phone', 'Created'])
-                    vehicles = self.db_manager.get_vehicles()
-                    for vehicle in vehicles:
-                        writer.writerow([vehicle['id'], vehicle['license_plate'], vehicle['brand'], 
-                                       vehicle['model'], vehicle['customer_phone'], vehicle['created_at']])
-                    
-                    writer.writerow([])  # Empty row
-                    
-                    # Work Orders
-                    writer.writerow(['WORK ORDERS'])
-                    writer.writerow(['ID', 'Vehicle ID', 'Entry Date', 'Status', 'Total Cost', 'Payment Status', 'Created'])
-                    work_orders = self.db_manager.get_work_orders()
-                    for wo in work_orders:
-                        writer.writerow([wo['id'], wo['vehicle_id'], wo['entry_date'], wo['status'], 
-                                       wo['total_cost'], wo['payment_status'], wo['created_at']])
+                # Customers
+                writer.writerows(_CUSTOMERS_HDR)
+                writer.writerows(self.db_manager.iter_customers())
                 
-                utils.show_info("Success", f"Data exported to {filename}")
+                writer.writerow(())  # Empty row
                 
-            except Exception as e:
-                utils.show_error("Error", f"Failed to export data: {e}")
+                # Vehicles
+                writer.writerows(_VEHICLES_HDR)
+                writer.writerows(self.db_manager.iter_vehicles())
+                
+                writer.writerow(())  # Empty row
+                
+                # Work Orders
+                writer.writerows(_WORK_ORDERS_HDR)
+                writer.writerows(self.db_manager.iter_work_orders())
+            
+            results.put(('ok', filename))
+        except Exception as e:
+            results.put(('error', e))
+    
+    def _drain_export_queue(self, results):
+        """Report the export result once the worker has finished"""
+        try:
+            status, payload = results.get_nowait()
+        except queue.Empty:
+            self.after(100, self._drain_export_queue, results)
+            return
+        if status == 'ok':
+            utils.show_info("Success", f"Data exported to {payload}")
+        else:
+            utils.show_error("Error", f"Failed to export data: {payload}")
 
 # Additional dialog classes for work order management
 
 class WorkOrderDetailsWindow:
     """Window for managing work order details"""
     
-    def __init__(self, parent, db_manager, work_order_id):
+    def __init__(self, parent, db_manager, work_order_id, app=None):
         self.parent = parent
         self.db_manager = db_manager
         self.work_order_id = work_order_id
+        self.app = app
+        self._refresh_job = None
         
         self.window = tk.Toplevel(parent)
         self.window.title("Work Order Details")
@@ -1685,50 +1889,78 @@ class WorkOrderDetailsWindow:
         self.update_total()
     
     def refresh_services(self):
-        """Refresh services list"""
+        """Refresh services list and return the services subtotal"""
         # Clear existing items
-        for item in self.services_tree.get_children():
-            self.services_tree.delete(item)
+        children = self.services_tree.get_children()
+        if children:
+            self.services_tree.delete(*children)
         
         # Load services
         services = self.db_manager.get_services_by_work_order(self.work_order_id)
-        for service in services:
-            total = service['quantity'] * service['price']
-            self.services_tree.insert('', END, values=(
-                service['id'],
-                service['name'],
-                utils.truncate_text(service['description'] or '', 30),
-                service['quantity'],
-                utils.format_currency(service['price']),
-                utils.format_currency(total),
-                'Yes' if (service['file_path'] or '').strip() else ''
-            ))
+        iids = _bulk_fill(self.services_tree, [(
+            service['id'],
+            service['name'],
+            _truncate(service['description'] or '', 30),
+            service['quantity'],
+            _fmt_currency(service['price']),
+            _fmt_currency(service['quantity'] * service['price']),
+            'Yes' if (service['file_path'] or '').strip() else ''
+        ) for service in services])
+        # Keep the fetched rows by item id so handlers need not read values back from Tk
+        self._service_rows = dict(zip(iids, services))
+        self._services_total = sum(service['quantity'] * service['price'] for service in services)
+        return self._services_total
     
     def refresh_parts(self):
-        """Refresh parts list"""
+        """Refresh parts list and return the parts subtotal"""
         # Clear existing items
-        for item in self.parts_tree.get_children():
-            self.parts_tree.delete(item)
+        children = self.parts_tree.get_children()
+        if children:
+            self.parts_tree.delete(*children)
         
         # Load parts
         parts = self.db_manager.get_spare_parts_by_work_order(self.work_order_id)
-        for part in parts:
-            total = part['quantity'] * part['price']
-            self.parts_tree.insert('', END, values=(
-                part['id'],
-                part['name'],
-                utils.truncate_text(part['description'] or '', 30),
-                part['quantity'],
-                utils.format_currency(part['price']),
-                utils.format_currency(total),
-                'Yes' if (part['file_path'] or '').strip() else ''
-            ))
+        iids = _bulk_fill(self.parts_tree, [(
+            part['id'],
+            part['name'],
+            _truncate(part['description'] or '', 30),
+            part['quantity'],
+            _fmt_currency(part['price']),
+            _fmt_currency(part['quantity'] * part['price']),
+            'Yes' if (part['file_path'] or '').strip() else ''
+        ) for part in parts])
+        # Keep the fetched rows by item id so handlers need not read values back from Tk
+        self._part_rows = dict(zip(iids, parts))
+        self._parts_total = sum(part['quantity'] * part['price'] for part in parts)
+        return self._parts_total
+    
+    def _schedule_refresh(self):
+        """Refresh services, parts and total once after a burst of edits"""
+        if self._refresh_job:
+            self.window.after_cancel(self._refresh_job)
+        self._refresh_job = self.window.after(50, self._do_refresh)
+    
+    def _do_refresh(self):
+        self._refresh_job = None
+        if not self.window.winfo_exists():
+            return
+        self.refresh_services()
+        self.refresh_parts()
+        self.update_total()
     
     def update_total(self):
         """Update total cost display"""
-        total_cost = self.db_manager.calculate_work_order_total(self.work_order_id)
+        # The subtotals come from the rows just loaded; the database copy of
+        # total_cost is kept current by the service/part CRUD methods
+        total_cost = self._services_total + self._parts_total
         self.total_label.config(text=f"Total Cost: {utils.format_currency(total_cost)}")
     
+    def _items_changed(self):
+        """Services or parts were edited: reload the lists and drop cached report stats"""
+        if self.app is not None:
+            self.app.invalidate_reports()
+        self._schedule_refresh()
+    
     def add_service(self):
         """Add service to work order"""
         dialog = ServiceDialog(self.window)
@@ -1748,8 +1980,7 @@ class WorkOrderDetailsWindow:
                     saved_path
                 )
                 utils.show_info("Success", "Service added successfully")
-                self.refresh_services()
-                self.update_total()
+                self._items_changed()
             except Exception as e:
                 utils.show_error("Error", f"Failed to add service: {e}")
     
@@ -1759,8 +1990,7 @@ class WorkOrderDetailsWindow:
         if not selection:
             utils.show_warning("No Selection", "Please select a service to update")
             return
-        item = self.services_tree.item(selection[0])
-        service_id = int(item['values'][0])
+        service_id = self._service_rows[selection[0]]['id']
         row = self.db_manager.get_service_by_id(service_id)
         if not row:
             utils.show_error("Error", "Service not found")
@@ -1791,8 +2021,7 @@ class WorkOrderDetailsWindow:
                     saved_path
                 )
                 utils.show_info("Success", "Service updated successfully")
-                self.refresh_services()
-                self.update_total()
+                self._items_changed()
             except Exception as e:
                 utils.show_error("Error", f"Failed to update service: {e}")
     
@@ -1803,16 +2032,15 @@ class WorkOrderDetailsWindow:
             utils.show_warning("No Selection", "Please select a service to remove")
             return
         
-        item = self.services_tree.item(selection[0])
-        service_id = item['values'][0]
-        service_name = item['values'][1]
+        row = self._service_rows[selection[0]]
+        service_id = row['id']
+        service_name = row['name']
         
         if utils.ask_yes_no("Confirm", f"Remove service '{service_name}'?"):
             try:
                 self.db_manager.delete_service(service_id, self.work_order_id)
                 utils.show_info("Success", "Service removed successfully")
-                self.refresh_services()
-                self.update_total()
+                self._items_changed()
             except Exception as e:
                 utils.show_error("Error", f"Failed to remove service: {e}")
     
@@ -1835,8 +2063,7 @@ class WorkOrderDetailsWindow:
                     saved_path
                 )
                 utils.show_info("Success", "Spare part added successfully")
-                self.refresh_parts()
-                self.update_total()
+                self._items_changed()
             except Exception as e:
                 utils.show_error("Error", f"Failed to add spare part: {e}")
     
@@ -1846,8 +2073,7 @@ class WorkOrderDetailsWindow:
         if not selection:
             utils.show_warning("No Selection", "Please select a part to update")
             return
-        item = self.parts_tree.item(selection[0])
-        part_id = int(item['values'][0])
+        part_id = self._part_rows[selection[0]]['id']
         row = self.db_manager.get_spare_part_by_id(part_id)
         if not row:
             utils.show_error("Error", "Part not found")
@@ -1878,8 +2104,7 @@ class WorkOrderDetailsWindow:
                     saved_path
                 )
                 utils.show_info("Success", "Part updated successfully")
-                self.refresh_parts()
-                self.update_total()
+                self._items_changed()
             except Exception as e:
                 utils.show_error("Error", f"Failed to update part: {e}")
     
@@ -1890,16 +2115,15 @@ class WorkOrderDetailsWindow:
             utils.show_warning("No Selection", "Please select a part to remove")
             return
         
-        item = self.parts_tree.item(selection[0])
-        part_id = item['values'][0]
-        part_name = item['values'][1]
+        row = self._part_rows[selection[0]]
+        part_id = row['id']
+        part_name = row['name']
         
         if utils.ask_yes_no("Confirm", f"Remove part '{part_name}'?"):
             try:
                 self.db_manager.delete_spare_part(part_id, self.work_order_id)
                 utils.show_info("Success", "Part removed successfully")
-                self.refresh_parts()
-                self.update_total()
+                self._items_changed()
             except Exception as e:
                 utils.show_error("Error", f"Failed to remove part: {e}")
     
@@ -1907,8 +2131,7 @@ class WorkOrderDetailsWindow:
         selection = self.services_tree.selection()
         if not selection:
             return
-        item = self.services_tree.item(selection[0])
-        service_id = int(item['values'][0])
+        service_id = self._service_rows[selection[0]]['id']
         row = self.db_manager.get_service_by_id(service_id)
         if not row:
             return
@@ -1918,8 +2141,7 @@ class WorkOrderDetailsWindow:
         selection = self.parts_tree.selection()
         if not selection:
             return
-        item = self.parts_tree.item(selection[0])
-        part_id = int(item['values'][0])
+        part_id = self._part_rows[selection[0]]['id']
         row = self.db_manager.get_spare_part_by_id(part_id)
         if not row:
             return
@@ -1992,14 +2214,12 @@ class InvoiceCreateDialog(BaseDialog):
         self.tree.column('Customer', width=200)
         self.tree.column('Total Cost', width=120)
         
-        # Populate with work orders
-        for wo in self.work_orders:
-            self.tree.insert('', END, values=(
-                wo['id'],
-                wo['license_plate'],
-                wo['customer_name'],
-                utils.format_currency(wo['total_cost'] or 0)
-            ))
+        # Populate with work orders (tree is not packed yet, so no relayout per row)
+        rows = [(wo['id'], wo['license_plate'], wo['customer_name'], _fmt_currency(wo['total_cost'] or 0))
+                for wo in self.work_orders]
+        insert = self.tree.insert
+        for values in rows:
+            insert('', END, values=values)
         
         # Scrollbar
         scrollbar = ttk.Scrollbar(main_frame, orient=VERTICAL, command=self.tree.yview)
@@ -2080,8 +2300,9 @@ class VehicleTypesFrame(BaseFrame):
         self.tree.bind('<<TreeviewSelect>>', self.on_select)
     
     def refresh(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
         rows = self.db_manager.get_vehicle_types()
         for row in rows:
             self.tree.insert('', END, values=(row['id'], row['brand'], row['model']))
@@ -2266,7 +2487,6 @@ class AssetsFrame(BaseFrame):
             dst_path = str(config.ASSETS_EMPLOYEES_DIR / filename)
             try:
                 os.makedirs(config.ASSETS_EMPLOYEES_DIR, exist_ok=True)
-                import shutil
                 shutil.copy2(src_file, dst_path)
             except Exception as e:
                 utils.show_error("File Error", f"Failed to copy file: {e}")
@@ -2298,7 +2518,6 @@ class AssetsFrame(BaseFrame):
             dst_path = str(config.ASSETS_EMPLOYEES_DIR / filename)
             try:
                 os.makedirs(config.ASSETS_EMPLOYEES_DIR, exist_ok=True)
-                import shutil
                 shutil.copy2(src_file, dst_path)
             except Exception as e:
                 utils.show_error("File Error", f"Failed to copy file: {e}")
@@ -2432,7 +2651,6 @@ class AssetsFrame(BaseFrame):
             dst_path = str(config.ASSETS_TOOLS_DIR / filename)
             try:
                 os.makedirs(config.ASSETS_TOOLS_DIR, exist_ok=True)
-                import shutil
                 shutil.copy2(src_file, dst_path)
             except Exception as e:
                 utils.show_error("File Error", f"Failed to copy file: {e}")
@@ -2464,7 +2682,6 @@ class AssetsFrame(BaseFrame):
             dst_path = str(config.ASSETS_TOOLS_DIR / filename)
             try:
                 os.makedirs(config.ASSETS_TOOLS_DIR, exist_ok=True)
-                import shutil
                 shutil.copy2(src_file, dst_path)
             except Exception as e:
                 utils.show_error("File Error", f"Failed to copy file: {e}")
@@ -2597,7 +2814,6 @@ class AssetsFrame(BaseFrame):
             dst_path = str(config.ASSETS_DIAGNOSTICS_DIR / filename)
             try:
                 os.makedirs(config.ASSETS_DIAGNOSTICS_DIR, exist_ok=True)
-                import shutil
                 shutil.copy2(src_file, dst_path)
             except Exception as e:
                 utils.show_error("File Error", f"Failed to copy file: {e}")
@@ -2629,7 +2845,6 @@ class AssetsFrame(BaseFrame):
             dst_path = str(config.ASSETS_DIAGNOSTICS_DIR / filename)
             try:
                 os.makedirs(config.ASSETS_DIAGNOSTICS_DIR, exist_ok=True)
-                import shutil
                 shutil.copy2(src_file, dst_path)
             except Exception as e:
                 utils.show_error("File Error", f"Failed to copy file: {e}")
@@ -2670,20 +2885,23 @@ class AssetsFrame(BaseFrame):
     
     def refresh(self):
         # Employees
-        for i in self.emp_tree.get_children():
-            self.emp_tree.delete(i)
+        children = self.emp_tree.get_children()
+        if children:
+            self.emp_tree.delete(*children)
         for r in self.db_manager.get_employees():
             self.emp_tree.insert('', END, values=(r['id'], r['name'], r['description'], r['number_of_working_days'], r['note'], r['file_path']))
         # Tools
-        for i in self.tool_tree.get_children():
-            self.tool_tree.delete(i)
+        children = self.tool_tree.get_children()
+        if children:
+            self.tool_tree.delete(*children)
         for r in self.db_manager.get_tools():
-            price = utils.format_currency(r['price'] or 0)
+            price = _fmt_currency(r['price'] or 0)
             self.tool_tree.insert('', END, values=(r['id'], r['name'], r['description'], price, r['note'], r['file_path']))
         # Diagnostics
-        for i in self.diag_tree.get_children():
-            self.diag_tree.delete(i)
+        children = self.diag_tree.get_children()
+        if children:
+            self.diag_tree.delete(*children)
         for r in self.db_manager.get_diagnostics():
-            price = utils.format_currency(r['price'] or 0)
+            price = _fmt_currency(r['price'] or 0)
             self.diag_tree.insert('', END, values=(r['id'], r['name'], r['description'], price, r['note'], r['file_path']))
 
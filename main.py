@@ -23,6 +23,8 @@ class WorkshopApp:
     def __init__(self):
         self.db_manager = DatabaseManager()
         self.current_frame = None
+        self.current_frame_name = None
+        self._pending_show = None
         self.frames = {}
         
         # Initialize theme settings from database
@@ -32,6 +34,8 @@ class WorkshopApp:
         self.root = ttkb.Window(themename=self.current_theme)
         self.setup_main_window()
         self.create_widgets()
+        # Build the default frame now so it is ready for the first paint
+        self.create_frame('customers')
         self.show_frame('customers')  # Show customers frame by default
         
     def setup_main_window(self):
@@ -118,13 +122,17 @@ class WorkshopApp:
         
         self.nav_buttons = {}
         
+        # Create every button first, then lay them out in one grid pass
         for frame_name, display_name, icon in nav_items:
             btn_text = f"{icon} {display_name}"
             btn = ttk.Button(nav_frame, text=btn_text, 
                            command=lambda f=frame_name: self.show_frame(f),
                            bootstyle='outline-info', width=18)
-            btn.pack(fill=X, pady=2)
             self.nav_buttons[frame_name] = btn
+        
+        nav_frame.grid_columnconfigure(0, weight=1)
+        for row, btn in enumerate(self.nav_buttons.values()):
+            btn.grid(row=row, column=0, sticky='ew', pady=2)
     
     def create_content_area(self):
         """Create the main content area"""
@@ -151,24 +159,38 @@ class WorkshopApp:
         time_label.pack(side=RIGHT, padx=10, pady=2)
     
     def show_frame(self, frame_name):
-        """Show the specified frame"""
-        # Update navigation button styles
-        for name, btn in self.nav_buttons.items():
-            if name == frame_name:
-                btn.configure(bootstyle='info')
-            else:
-                btn.configure(bootstyle='outline-info')
+        """Show the specified frame once the event loop is idle.
         
-        # Hide current frame
-        if self.current_frame:
-            self.current_frame.pack_forget()
+        Rapid successive calls collapse into a single swap to the last
+        requested frame.
+        """
+        if self._pending_show is None:
+            self.root.after_idle(self._apply_show)
+        self._pending_show = frame_name
+    
+    def _apply_show(self):
+        """Swap in the most recently requested frame"""
+        frame_name, self._pending_show = self._pending_show, None
+        if frame_name is None or frame_name == self.current_frame_name:
+            return
         
-        # Create or show the requested frame
+        # Build the frame first so a failure leaves the current view intact
+        # and a later click can retry
         if frame_name not in self.frames:
             self.create_frame(frame_name)
         
+        # Hide current frame and show the requested one
+        if self.current_frame:
+            self.current_frame.pack_forget()
         self.current_frame = self.frames[frame_name]
         self.current_frame.pack(fill=BOTH, expand=True)
+        previous, self.current_frame_name = self.current_frame_name, frame_name
+        
+        # Update navigation button styles; only the old and new buttons change
+        if previous in self.nav_buttons:
+            self.nav_buttons[previous].configure(bootstyle='outline-info')
+        if frame_name in self.nav_buttons:
+            self.nav_buttons[frame_name].configure(bootstyle='info')
         
         # Update status
         frame_titles = {
@@ -211,6 +233,12 @@ class WorkshopApp:
             label.pack(expand=True)
             self.frames[frame_name] = placeholder
     
+    def invalidate_reports(self):
+        """Drop cached report statistics after work order or customer changes"""
+        reports = self.frames.get('reports')
+        if reports is not None:
+            reports.invalidate()
+    
     def refresh_current_frame(self):
         """Refresh the current frame"""
         if self.current_frame and hasattr(self.current_frame, 'refresh'):
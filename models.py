@@ -1,11 +1,17 @@
 """
 Data models for the Vehicle Repair Workshop Management System
 """
-from dataclasses import dataclass
+import sys
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional
 
-@dataclass
+def _intern(value):
+    """sys.intern for low-cardinality joined strings; passes None and non-str through"""
+    return sys.intern(value) if type(value) is str else value
+
+@dataclass(slots=True)
 class Customer:
     id: Optional[int] = None
     name: str = ""
@@ -17,7 +23,7 @@ class Customer:
         if self.created_at is None:
             self.created_at = datetime.now()
 
-@dataclass
+@dataclass(slots=True)
 class Vehicle:
     id: Optional[int] = None
     license_plate: str = ""
@@ -31,7 +37,7 @@ class Vehicle:
         if self.created_at is None:
             self.created_at = datetime.now()
 
-@dataclass
+@dataclass(slots=True)
 class WorkOrder:
     id: Optional[int] = None
     vehicle_id: int = 0
@@ -54,7 +60,28 @@ class WorkOrder:
         if not self.entry_date:
             self.entry_date = datetime.now().strftime('%Y-%m-%d')
 
-@dataclass
+@dataclass(slots=True)
+class WorkOrderColumns:
+    """Work order list view rows stored column by column"""
+    ids: List[int] = field(default_factory=list)
+    license_plates: List[str] = field(default_factory=list)
+    customer_names: List[str] = field(default_factory=list)
+    entry_dates: List[str] = field(default_factory=list)
+    statuses: List[str] = field(default_factory=list)
+    total_costs: array = field(default_factory=lambda: array('d'))
+    payment_statuses: List[str] = field(default_factory=list)
+    
+    @classmethod
+    def from_rows(cls, rows) -> "WorkOrderColumns":
+        """Build from (id, license_plate, customer_name, entry_date, status, total_cost, payment_status) tuples"""
+        if not rows:
+            return cls()
+        ids, plates, names, dates, statuses, costs, payments = zip(*rows)
+        return cls(list(ids), list(plates), list(map(_intern, names)), list(dates),
+                   list(map(_intern, statuses)), array('d', [c or 0.0 for c in costs]),
+                   list(map(_intern, payments)))
+
+@dataclass(slots=True)
 class Service:
     id: Optional[int] = None
     work_order_id: int = 0
@@ -67,7 +94,7 @@ class Service:
     def total_price(self) -> float:
         return self.quantity * self.price
 
-@dataclass
+@dataclass(slots=True)
 class SparePart:
     id: Optional[int] = None
     work_order_id: int = 0
@@ -80,7 +107,7 @@ class SparePart:
     def total_price(self) -> float:
         return self.quantity * self.price
 
-@dataclass
+@dataclass(slots=True)
 class Invoice:
     id: Optional[int] = None
     work_order_id: int = 0
@@ -101,23 +128,54 @@ class Invoice:
         if not self.invoice_date:
             self.invoice_date = datetime.now().strftime('%Y-%m-%d')
 
-@dataclass
+@dataclass(slots=True)
+class InvoiceColumns:
+    """Invoice list view rows stored column by column"""
+    ids: List[int] = field(default_factory=list)
+    work_order_ids: List[int] = field(default_factory=list)
+    invoice_dates: List[str] = field(default_factory=list)
+    total_amounts: array = field(default_factory=lambda: array('d'))
+    statuses: List[str] = field(default_factory=list)
+    customer_names: List[str] = field(default_factory=list)
+    customer_phones: List[str] = field(default_factory=list)
+    
+    @classmethod
+    def from_rows(cls, rows) -> "InvoiceColumns":
+        """Build from (id, work_order_id, invoice_date, total_amount, status, customer_name, customer_phone) tuples"""
+        if not rows:
+            return cls()
+        ids, wo_ids, dates, amounts, statuses, names, phones = zip(*rows)
+        return cls(list(ids), list(wo_ids), list(dates), array('d', [a or 0.0 for a in amounts]),
+                   list(map(_intern, statuses)), list(map(_intern, names)), list(phones))
+
+@dataclass(slots=True)
+class TopList:
+    """Top-N report rows stored column by column"""
+    names: List[str] = field(default_factory=list)
+    details: List[Optional[str]] = field(default_factory=list)
+    counts: array = field(default_factory=lambda: array('q'))
+    values: array = field(default_factory=lambda: array('d'))
+    
+    @classmethod
+    def from_rows(cls, rows, value_type: str = 'd') -> "TopList":
+        """Build from (name, detail, count, value) tuples; value_type is the array typecode for values"""
+        if not rows:
+            return cls(values=array(value_type))
+        names, details, counts, values = zip(*rows)
+        return cls(list(map(_intern, names)), list(details), array('q', counts),
+                   array(value_type, [v or 0 for v in values]))
+
+@dataclass(slots=True)
 class ReportStats:
     total_orders: int = 0
     completed_orders: int = 0
     open_orders: int = 0
     total_revenue: float = 0.0
     avg_order_value: float = 0.0
-    top_services: List[dict] = None
-    top_customers: List[dict] = None
-    
-    def __post_init__(self):
-        if self.top_services is None:
-            self.top_services = []
-        if self.top_customers is None:
-            self.top_customers = []
+    top_services: TopList = field(default_factory=TopList)
+    top_customers: TopList = field(default_factory=TopList)
 
-@dataclass
+@dataclass(slots=True)
 class Appointment:
     id: Optional[int] = None
     name: str = ""
@@ -2,6 +2,7 @@
 Utility functions for the Vehicle Repair Workshop Management System
 """
 import os
+import re
 import tkinter as tk
 from tkinter import messagebox, filedialog
 from PIL import Image, ImageTk
@@ -9,11 +10,19 @@ import subprocess
 import platform
 from datetime import datetime, timedelta
 from typing import Optional, Any
+from functools import lru_cache
 import config
 import shutil
-import uuid
 from pathlib import Path
 
+# Characters allowed as phone number separators
+_PHONE_STRIP = str.maketrans('', '', ' -()')
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+_IS_MAC = platform.system() == 'Darwin'
+_IS_WIN = platform.system() == 'Windows'
+
 def show_error(title: str, message: str):
     """Show error message dialog"""
     messagebox.showerror(title, message)
@@ -32,53 +41,75 @@ def ask_yes_no(title: str, message: str) -> bool:
 
 def validate_phone(phone: str) -> bool:
     """Validate phone number format"""
-    # Remove spaces and dashes
-    phone_clean = phone.replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
+    # Remove spaces, dashes and parentheses in one pass
+    phone_clean = phone.translate(_PHONE_STRIP)
     # Check if it contains only digits and has reasonable length
     return phone_clean.isdigit() and 7 <= len(phone_clean) <= 15
 
 def validate_email(email: str) -> bool:
     """Basic email validation"""
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return _EMAIL_RE.match(email) is not None
 
 def format_currency(amount: float) -> str:
     """Format amount as currency"""
     return f"${amount:,.2f}"
 
+@lru_cache(maxsize=4096)
 def format_date(date_str: str) -> str:
-    """Format date string for display"""
+    """Format date string for display (memoized; list views repeat the same dates)"""
     try:
         date_obj = datetime.strptime(date_str, '%Y-%m-%d')
         return date_obj.strftime('%m/%d/%Y')
-    except:
+    except (TypeError, ValueError):
         return date_str
 
+_range_cache = (None, None)  # (date computed for, options)
+
 def get_date_range_options() -> list:
-    """Get predefined date range options"""
-    today = datetime.now()
+    """Get predefined date range options, computed once per calendar day"""
+    global _range_cache
+    today = datetime.now().date()
+    if _range_cache[0] == today:
+        return _range_cache[1]
+    
+    today_str = today.strftime('%Y-%m-%d')
+    month_start = today.replace(day=1)
+    last_month_end = month_start - timedelta(days=1)
     options = [
-        ("Today", today.strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')),
-        ("This Week", (today - timedelta(days=today.weekday())).strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')),
-        ("This Month", today.replace(day=1).strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')),
-        ("Last Month", (today.replace(day=1) - timedelta(days=1)).replace(day=1).strftime('%Y-%m-%d'), 
-         (today.replace(day=1) - timedelta(days=1)).strftime('%Y-%m-%d')),
-        ("This Year", today.replace(month=1, day=1).strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')),
+        ("Today", today_str, today_str),
+        ("This Week", (today - timedelta(days=today.weekday())).strftime('%Y-%m-%d'), today_str),
+        ("This Month", month_start.strftime('%Y-%m-%d'), today_str),
+        ("Last Month", last_month_end.replace(day=1).strftime('%Y-%m-%d'),
+         last_month_end.strftime('%Y-%m-%d')),
+        ("This Year", today.replace(month=1, day=1).strftime('%Y-%m-%d'), today_str),
         ("Last Year", today.replace(year=today.year-1, month=1, day=1).strftime('%Y-%m-%d'),
          today.replace(year=today.year-1, month=12, day=31).strftime('%Y-%m-%d'))
     ]
+    _range_cache = (today, options)
     return options
 
 def load_image(image_path: str, size: tuple = None) -> Optional[ImageTk.PhotoImage]:
     """Load and resize image for tkinter"""
     try:
-        if not os.path.exists(image_path):
-            return None
-        
+        mtime = os.stat(image_path).st_mtime_ns
+    except OSError:
+        return None
+    return _load_image_cached(image_path, size, mtime)
+
+@lru_cache(maxsize=256)
+def _load_image_cached(image_path: str, size: Optional[tuple], mtime: int) -> Optional[ImageTk.PhotoImage]:
+    """Decode and resize once per (path, size, mtime); the cache also keeps the PhotoImage alive"""
+    try:
         image = Image.open(image_path)
         if size:
-            image = image.resize(size, Image.Resampling.LANCZOS)
+            # LANCZOS only pays off on large downscales; bilinear is
+            # indistinguishable within 2x and several times cheaper
+            width, height = image.size
+            if width <= size[0] * 2 and height <= size[1] * 2:
+                resample = Image.Resampling.BILINEAR
+            else:
+                resample = Image.Resampling.LANCZOS
+            image = image.resize(size, resample)
         
         return ImageTk.PhotoImage(image)
     except Exception as e:
@@ -113,6 +144,25 @@ def select_attachment_file() -> Optional[str]:
     ]
     return filedialog.askopenfilename(title="Select Attachment", filetypes=filetypes)
 
+_assets_root = None
+
+def _get_assets_root() -> Path:
+    """Resolved assets directory, computed on first use"""
+    global _assets_root
+    if _assets_root is None:
+        _assets_root = config.ASSETS_DIR.resolve()
+    return _assets_root
+
+_mkdir_cache = set()
+
+def _ensure_dir(path: Path):
+    """mkdir -p, skipped for directories already created by this process"""
+    key = str(path)
+    if key in _mkdir_cache:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _mkdir_cache.add(key)
+
 def save_attachment_for_item(src_path: str, work_order_id: int, item_type: str, item_id: Optional[int] = None) -> Optional[str]:
     """Copy the selected attachment into assets under work_orders/services or spare_parts.
 
@@ -120,13 +170,16 @@ def save_attachment_for_item(src_path: str, work_order_id: int, item_type: str,
     Returns the relative saved path string, or None if failed.
     """
     try:
-        if not src_path or not os.path.exists(src_path):
+        if not src_path:
+            return None
+        try:
+            st = os.stat(src_path)
+        except OSError:
             return None
         # If already within assets, don't copy
         try:
-            assets_root = (config.ASSETS_DIR).resolve()
             src_resolved = (Path(src_path)).resolve()
-            src_resolved.relative_to(assets_root)
+            src_resolved.relative_to(_get_assets_root())
             return str(src_resolved)
         except Exception:
             pass
@@ -137,13 +190,15 @@ def save_attachment_for_item(src_path: str, work_order_id: int, item_type: str,
             base_dir = config.ASSETS_PART_ATTACHMENTS_DIR
         # Create work order subfolder
         target_dir = base_dir / f"wo_{work_order_id}"
-        target_dir.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(target_dir)
         # Build unique filename, preserving extension
         ext = os.path.splitext(src_path)[1]
-        unique = uuid.uuid4().hex[:12]
+        unique = os.urandom(6).hex()
         name = f"{item_type}_{item_id or 'new'}_{unique}{ext}"
         dst_path = target_dir / name
-        shutil.copy2(src_path, dst_path)
+        # copyfile takes the sendfile/fcopyfile fast path where available
+        shutil.copyfile(src_path, dst_path)
+        os.utime(dst_path, ns=(st.st_atime_ns, st.st_mtime_ns))
         return str(dst_path)
     except Exception as e:
         show_error("Error", f"Failed to save attachment: {e}")
@@ -173,42 +228,58 @@ def save_file_dialog(defaultextension: str = ".pdf", filetypes: list = None) ->
 def open_file_externally(filepath: str):
     """Open file with system default application"""
     try:
-        if platform.system() == 'Darwin':  # macOS
-            subprocess.call(('open', filepath))
-        elif platform.system() == 'Windows':  # Windows
+        # Popen rather than call: don't block the UI while the viewer starts
+        if _IS_MAC:
+            subprocess.Popen(('open', filepath))
+        elif _IS_WIN:
             os.startfile(filepath)
         else:  # Linux
-            subprocess.call(('xdg-open', filepath))
+            subprocess.Popen(('xdg-open', filepath))
     except Exception as e:
         show_error("Error", f"Could not open file: {e}")
 
+_screen_size = None
+
 def center_window(window: tk.Tk, width: int, height: int):
     """Center window on screen"""
-    screen_width = window.winfo_screenwidth()
-    screen_height = window.winfo_screenheight()
+    global _screen_size
+    if _screen_size is None:
+        # The app runs on a single screen; ask Tk once
+        _screen_size = (window.winfo_screenwidth(), window.winfo_screenheight())
+    screen_width, screen_height = _screen_size
     
     x = (screen_width - width) // 2
     y = (screen_height - height) // 2
     
     window.geometry(f"{width}x{height}+{x}+{y}")
 
+_tooltip_win = None
+_tooltip_label = None
+
+def _get_tooltip():
+    """Shared tooltip window, created hidden on first use"""
+    global _tooltip_win, _tooltip_label
+    if _tooltip_win is None or not _tooltip_win.winfo_exists():
+        _tooltip_win = tk.Toplevel()
+        _tooltip_win.wm_overrideredirect(True)
+        _tooltip_win.withdraw()
+        _tooltip_label = tk.Label(_tooltip_win, background="lightyellow",
+                                  relief="solid", borderwidth=1, font=config.FONTS['small'])
+        _tooltip_label.pack()
+    return _tooltip_win, _tooltip_label
+
 def create_tooltip(widget, text: str):
     """Create tooltip for widget"""
     def on_enter(event):
-        tooltip = tk.Toplevel()
-        tooltip.wm_overrideredirect(True)
+        tooltip, label = _get_tooltip()
+        label.config(text=text)
         tooltip.wm_geometry(f"+{event.x_root+10}+{event.y_root+10}")
-        
-        label = tk.Label(tooltip, text=text, background="lightyellow", 
-                        relief="solid", borderwidth=1, font=config.FONTS['small'])
-        label.pack()
-        
-        widget.tooltip = tooltip
+        tooltip.deiconify()
+        tooltip.lift()
     
     def on_leave(event):
-        if hasattr(widget, 'tooltip'):
-            widget.tooltip.destroy()
-            del widget.tooltip
+        if _tooltip_win is not None and _tooltip_win.winfo_exists():
+            _tooltip_win.withdraw()
     
     widget.bind("<Enter>", on_enter)
     widget.bind("<Leave>", on_leave)
@@ -245,14 +316,22 @@ class NumberEntry(tk.Entry):
         self.config(validate='key', validatecommand=vcmd)
     
     def validate_input(self, value_if_allowed):
+        # Runs on every keystroke: scan characters rather than parse
         if value_if_allowed == "":
             return True
         
-        if self.allow_decimal:
-            try:
-                float(value_if_allowed)
-                return True
-            except ValueError:
-                return False
-        else:
+        if not self.allow_decimal:
             return value_if_allowed.isdigit()
+        
+        start = 1 if value_if_allowed[0] == '-' else 0
+        if start == len(value_if_allowed):
+            return False
+        seen_dot = False
+        for ch in value_if_allowed[start:]:
+            if ch == '.':
+                if seen_dot:
+                    return False
+                seen_dot = True
+            elif not '0' <= ch <= '9':
+                return False
+        return True